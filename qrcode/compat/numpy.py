@@ -0,0 +1,7 @@
+# Try to import numpy library.
+np = None
+
+try:
+    import numpy as np  # noqa: F401
+except ImportError:
+    pass
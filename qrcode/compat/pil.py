@@ -0,0 +1,7 @@
+# Try to import PIL library.
+Image = None
+
+try:
+    from PIL import Image  # noqa: F401
+except ImportError:
+    pass
@@ -1,7 +1,9 @@
 # Try to import png library.
 PngWriter = None
+PngProtocolError = None
 
 try:
+    from png import ProtocolError as PngProtocolError  # noqa: F401
     from png import Writer as PngWriter  # noqa: F401
 except ImportError:
     pass
@@ -8,14 +8,20 @@ a pipe to a file an image is written. The default image format is PNG.
 
 from __future__ import annotations
 
+import io
 import optparse
 import os
 import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import cache
 from importlib import metadata
 from pathlib import Path
-from typing import TYPE_CHECKING, NoReturn
+from typing import TYPE_CHECKING, Any, NoReturn
 
 import qrcode
+from qrcode.exceptions import DataOverflowError
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -45,6 +51,17 @@ error_correction = {
     "H": qrcode.ERROR_CORRECT_H,
 }
 
+# Favour encode speed over file size for batch runs
+CSV_COMPRESS_LEVEL = 1
+# Reuse the version and mask pattern of the first CSV row with the same URL
+# length (see make_csv_qr). Turn off to fit every row from scratch.
+REUSE_CSV_QR_SETTINGS = True
+# CSV label text is rendered at this multiple of its final size. Pillow's
+# hinted anti-aliasing is already smooth at the final size.
+LABEL_SCALE = 1
+# Let Pillow hand a whole CSV image to its PNG encoder in one block
+CSV_PIL_MAXBLOCK = 2**22
+
 
 def generate_from_csv(
     csv_path: str,
@@ -55,8 +72,19 @@ def generate_from_csv(
     base_url: str,
     skip_header: bool = False,
     qr_size: int | None = None,
+    workers: int | None = None,
+    output_zip: str | None = None,
 ) -> None:
-    """Generate QR codes from CSV file data."""
+    """
+    Generate QR codes from CSV file data.
+
+    Rows are rendered in ``workers`` processes (defaults to the CPU count),
+    or threads where the platform can't start worker processes. Use
+    ``workers=1`` to render them in the current process.
+
+    If ``output_zip`` is given, the images are stored in that zip archive
+    instead of as separate files in ``output_dir``.
+    """
     import csv
 
     # Read data from CSV file
@@ -80,9 +108,10 @@ def generate_from_csv(
         print("No data found in the specified column.")
         return
 
-    # Create output directory if it doesn't exist
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
+    if not output_zip:
+        # Create output directory if it doesn't exist
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
 
     # Set up image factory - use PIL for text support
     if factory:
@@ -99,143 +128,348 @@ def generate_from_csv(
             print("PIL/Pillow not available, falling back to SVG (no text labels)")
             image_factory = get_factory("qrcode.image.svg.SvgPathImage")
 
+    # Only Pillow images can have a text label drawn in
+    try:
+        from qrcode.image.pil import PilImage  # noqa: PLC0415
+        from qrcode.image.styledpil import StyledPilImage  # noqa: PLC0415
+    except ImportError:
+        with_label = False
+    else:
+        with_label = issubclass(image_factory, (PilImage, StyledPilImage))
+
     # Generate QR codes
     error_corr = error_correction[error_correction_level]
-    count = 0
-
+    # (URL length) -> (version, mask pattern), fitted here in CSV order so the
+    # output doesn't depend on which worker renders which row first
+    qr_settings: dict[int, tuple[int, int]] = {}
+    # Part number of every row, in CSV order
+    rows = []
+    # Part number -> rows that repeat it after the current one. Repeats reuse
+    # the image of the first row, so each distinct image is only rendered once.
+    repeats: dict[str, int] = {}
+    jobs = []
     for row in values:
         if not row or not row[0].strip():
             continue
-
         part_number = row[0].strip()
-        # Sanitize filename - replace invalid characters
-        safe_filename = "".join(
-            c if c.isalnum() or c in "._- " else "_" for c in part_number
-        )
-        output_file = output_path / f"{safe_filename}.png"
-
+        rows.append(part_number)
+        if part_number in repeats:
+            repeats[part_number] += 1
+            continue
+        repeats[part_number] = 0
         # Build full URL with part number
         full_url = f"{base_url}?part={part_number}"
+        settings = None
+        if REUSE_CSV_QR_SETTINGS:
+            settings = qr_settings.get(len(full_url))
+            if settings is None:
+                settings = fit_csv_qr_settings(full_url, error_corr)
+                qr_settings[len(full_url)] = settings
+        jobs.append(
+            (
+                part_number,
+                full_url,
+                image_factory,
+                error_corr,
+                qr_size,
+                with_label,
+                settings,
+            )
+        )
 
-        # Generate QR code
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    count = 0
+
+    with ExitStack() as stack:
+        if workers > 1:
+            # Every row is independent, CPU bound work, so spread the rows
+            # over worker processes. map() still yields in CSV order.
+            try:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            except (NotImplementedError, OSError):
+                # No multiprocessing support here (e.g. no working
+                # semaphores). Pillow releases the GIL while encoding, so
+                # threads still overlap part of the work.
+                executor = ThreadPoolExecutor(max_workers=workers)
+            stack.enter_context(executor)
+            chunksize = max(1, min(16, len(jobs) // (workers * 4)))
+            results = executor.map(_render_one, jobs, chunksize=chunksize)
+        else:
+            results = map(_render_one, jobs)
+        if output_zip:
+            # PNG data is already deflated, so store it as is
+            archive = stack.enter_context(
+                zipfile.ZipFile(output_zip, "w", zipfile.ZIP_STORED)
+            )
+        # When part numbers sanitise to the same file name the last row wins,
+        # so only that row is written (a zip couldn't overwrite an entry
+        # anyway). Files are written here rather than in the workers, so
+        # there's a single writer per file.
+        last_rows = {csv_filename(part_number): i for i, part_number in enumerate(rows)}
+        rendered: dict[str, tuple[str, str, bytes]] = {}
+        for i, part_number in enumerate(rows):
+            if part_number in rendered:
+                filename, full_url, data = rendered[part_number]
+            else:
+                # Results come in the order part numbers first appear
+                filename, full_url, data = next(results)
+            # Only hold on to an image while later rows still need it
+            if repeats[part_number]:
+                repeats[part_number] -= 1
+                rendered[part_number] = (filename, full_url, data)
+            else:
+                rendered.pop(part_number, None)
+            output_file = filename if output_zip else output_path / filename
+            if last_rows[filename] == i:
+                if output_zip:
+                    archive.writestr(filename, data)
+                else:
+                    output_file.write_bytes(data)
+            count += 1
+            print(f"Generated: {output_file} -> {full_url}")
+
+    if output_zip:
+        print(f"\nSuccessfully generated {count} QR codes in '{output_zip}'")
+    else:
+        print(f"\nSuccessfully generated {count} QR codes in '{output_dir}/'")
+
+
+def _render_one(job: tuple) -> tuple[str, str, bytes]:
+    """
+    Render the QR code for one CSV row.
+
+    This runs in the worker processes of :func:`generate_from_csv`, so
+    ``job`` only holds picklable values (the image factory class pickles by
+    reference).
+
+    Returns the file name, the encoded URL and the image data. Writing is left
+    to the caller, so there is only ever one writer per file.
+    """
+    (
+        part_number,
+        full_url,
+        image_factory,
+        error_corr,
+        qr_size,
+        with_label,
+        settings,
+    ) = job
+
+    filename = csv_filename(part_number)
+    data = render_csv_image(
+        part_number, full_url, image_factory, error_corr, qr_size, with_label, settings
+    )
+    return filename, full_url, data
+
+
+def csv_filename(part_number: str) -> str:
+    """
+    Return the image file name for a CSV part number.
+    """
+    # Sanitize filename - replace invalid characters
+    safe_filename = "".join(
+        c if c.isalnum() or c in "._- " else "_" for c in part_number
+    )
+    return f"{safe_filename}.png"
+
+
+def render_csv_image(
+    part_number: str,
+    full_url: str,
+    image_factory: type[BaseImage],
+    error_corr: int,
+    qr_size: int | None,
+    with_label: bool,
+    settings: tuple[int, int] | None = None,
+) -> bytes:
+    """
+    Render the QR code for one CSV row and return the encoded file.
+
+    ``with_label`` draws the part number below the QR code, which needs a
+    Pillow based ``image_factory``. ``settings`` is passed on to
+    :func:`make_csv_qr`.
+    """
+    # Generate QR code
+    qr = make_csv_qr(full_url, image_factory, error_corr, qr_size, settings)
+
+    # Create QR code image
+    # The QR code is turned a quarter turn to line up with the rotated label
+    img = qr.make_image(fill_color="black", back_color="white", rotate_quadrant=True)
+
+    # Add text label below QR code if using PIL
+    if with_label:
+        from PIL import Image, ImageDraw
+
+        # Draw text directly on the existing image in the allocated text area
+        draw = ImageDraw.Draw(img._img)
+
+        # Cached, so each process loads the fonts once
+        font, font_hr = load_label_fonts(LABEL_SCALE)
+        set_pil_maxblock(CSV_PIL_MAXBLOCK)
+
+        # Calculate proper size based on actual text measurement
+        bbox = draw.textbbox((0, 0), part_number, font=font, anchor="mm")
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        # Add padding
+        padding = 40
+        target_width = text_width + padding * 2
+        target_height = text_height + padding * 2
+
+        # Draw the label as its own paste mask (text 255 on 0), supersampled
+        # only when LABEL_SCALE asks for it
+        text_mask = Image.new(
+            "L", (target_width * LABEL_SCALE, target_height * LABEL_SCALE), 0
+        )
+        ImageDraw.Draw(text_mask).text(
+            (text_mask.width // 2, text_mask.height // 2),
+            part_number,
+            fill=255,
+            font=font_hr,
+            anchor="mm",
+        )
+        if LABEL_SCALE > 1:
+            text_mask = text_mask.resize(
+                (target_width, target_height), Image.Resampling.LANCZOS
+            )
+        if img._img.mode == "1":
+            # A 1-bit canvas can't hold anti-aliased edges
+            text_mask = text_mask.convert("1", dither=Image.Dither.NONE)
+
+        # Rotate text 90 degrees clockwise
+        text_mask = text_mask.transpose(Image.ROTATE_270)
+
+        # Calculate position to center the rotated text in the text area
+        # After rotation, width and height are swapped
+        text_x = img.qr_offset_x + (img.pixel_size - text_mask.width) // 2
+        text_y = img.text_offset_y + (img.text_area_height - text_mask.height) // 2
+
+        # Fill the text straight into the QR canvas through the mask
+        img._img.paste("black", (text_x, text_y), mask=text_mask)
+
+    # Encode in memory so the file is written with a single write
+    buffer = io.BytesIO()
+    if with_label:
+        # Save the image (already has text drawn on it)
+        img.save(buffer, compress_level=CSV_COMPRESS_LEVEL, optimize=False)
+    else:
+        # Fallback for non-PIL images (SVG)
+        img.save(buffer)
+    return buffer.getvalue()
+
+
+def make_csv_qr(
+    full_url: str,
+    image_factory: type[BaseImage],
+    error_corr: int,
+    qr_size: int | None,
+    settings: tuple[int, int] | None = None,
+) -> qrcode.QRCode:
+    """
+    Build and compile the QR code for one CSV row.
+
+    URLs in a batch share the base URL, so rows with the same length almost
+    always end up with the same version. ``settings`` is the
+    ``(version, mask_pattern)`` found by :func:`fit_csv_qr_settings` for the
+    first such row; using it skips the version fit and the mask pattern
+    search. A row that doesn't fit it is fitted again.
+    """
+    if settings is not None:
+        version, mask_pattern = settings
         qr = qrcode.QRCode(
+            version=version,
             error_correction=error_corr,
             image_factory=image_factory,
             border=4,
+            mask_pattern=mask_pattern,
             qr_size=qr_size,
+            compress_level=CSV_COMPRESS_LEVEL,
         )
         qr.add_data(full_url)
-        qr.make(fit=True)
-
-        # Create QR code image
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Add text label below QR code if using PIL
-        if hasattr(img, '_img'):  # Check if it's a PIL image
-            from PIL import Image, ImageDraw, ImageFont, ImageOps
-
-            # First, rotate the QR code portion 90 degrees counter-clockwise
-            qr_region = img._img.crop((
-                img.qr_offset_x,
-                img.qr_offset_y,
-                img.qr_offset_x + img.pixel_size,
-                img.qr_offset_y + img.pixel_size
-            ))
-            qr_rotated = qr_region.transpose(Image.ROTATE_270)
-            img._img.paste(qr_rotated, (img.qr_offset_x, img.qr_offset_y))
-
-            # Draw text directly on the existing image in the allocated text area
-            draw = ImageDraw.Draw(img._img)
-
-            # Use a much larger font size for better rendering quality (scaled for 2x canvas, increased by 25%)
-            font_size = 100  # Increased by 25% from 80 to 100
-            font = None
-
-            # Try multiple font locations - prefer very smooth, modern fonts
-            font_paths = [
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",  # Clean sans-serif
-                "/usr/share/fonts/liberation/LiberationSans-Regular.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Regular weight is smoother
-                "/usr/share/fonts/TTF/DejaVuSans.ttf",
-                "/usr/share/fonts/noto/NotoSans-Regular.ttf",
-                "/usr/share/fonts/truetype/ubuntu/Ubuntu-Regular.ttf",
-                "/usr/share/fonts/truetype/roboto/Roboto-Regular.ttf",
-                "/usr/share/fonts/google-noto/NotoSans-Regular.ttf",
-            ]
-
-            for font_path in font_paths:
-                try:
-                    font = ImageFont.truetype(font_path, font_size)
-                    break
-                except:
-                    continue
-
-            if font is None:
-                print(f"WARNING: Could not load TrueType font. Using default font.")
-                print(f"Install fonts with: sudo pacman -S ttf-dejavu")
-                font = ImageFont.load_default()
-                font_size = 80  # Fallback size for default font at 2x resolution
-
-            # Render vector font at very high resolution for ultra-smooth rasterization
-            # Calculate proper size based on actual text measurement
-            bbox = draw.textbbox((0, 0), part_number, font=font, anchor='mm')
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            # Add padding
-            padding = 40
-            target_width = text_width + padding * 2
-            target_height = text_height + padding * 2
-
-            # Render at 20x resolution for ultra-smooth vector rasterization
-            scale = 20
-            hr_width = target_width * scale
-            hr_height = target_height * scale
-
-            # Create very high-res grayscale image for superior anti-aliasing
-            text_img_hr = Image.new('L', (hr_width, hr_height), 255)
-            text_draw_hr = ImageDraw.Draw(text_img_hr)
-
-            # Load font at scaled size
-            font_hr = ImageFont.truetype(font.path, font_size * scale)
-
-            # Draw text centered in high-res image (grayscale for better AA)
-            text_center_x = hr_width // 2
-            text_center_y = hr_height // 2
-            text_draw_hr.text((text_center_x, text_center_y), part_number, fill=0, font=font_hr, anchor='mm')
-
-            # Downsample with LANCZOS for ultra-smooth result
-            text_img_gray = text_img_hr.resize((target_width, target_height), Image.Resampling.LANCZOS)
-
-            # Convert to RGB
-            text_img = Image.new('RGB', (target_width, target_height), 'white')
-            text_img.paste(Image.new('RGB', text_img_gray.size, 'black'), mask=ImageOps.invert(text_img_gray))
-
-            # Rotate text 90 degrees counter-clockwise
-            text_rotated = text_img.transpose(Image.ROTATE_270)
-
-            # Calculate position to center the rotated text in the text area
-            # After rotation, width and height are swapped
-            rotated_width = text_rotated.width
-            rotated_height = text_rotated.height
-
-            text_x = img.qr_offset_x + (img.pixel_size - rotated_width) // 2
-            text_y = img.text_offset_y + (img.text_area_height - rotated_height) // 2
-
-            # Paste the rotated text
-            img._img.paste(text_rotated, (text_x, text_y))
-
-            # Save the image (already has text drawn on it)
-            img.save(output_file)
+        try:
+            qr.make(fit=False)
+        except DataOverflowError:
+            pass
         else:
-            # Fallback for non-PIL images (SVG)
-            with output_file.open("wb") as f:
-                img.save(f)
+            return qr
 
-        count += 1
-        print(f"Generated: {output_file} -> {full_url}")
+    qr = qrcode.QRCode(
+        error_correction=error_corr,
+        image_factory=image_factory,
+        border=4,
+        qr_size=qr_size,
+        compress_level=CSV_COMPRESS_LEVEL,
+    )
+    qr.add_data(full_url)
+    qr.best_fit()
+    qr.mask_pattern = qr.best_mask_pattern()
+    qr.make(fit=False)
+    return qr
+
+
+def fit_csv_qr_settings(full_url: str, error_corr: int) -> tuple[int, int]:
+    """
+    Find the version and mask pattern :func:`make_csv_qr` would pick for
+    ``full_url``.
+    """
+    qr = qrcode.QRCode(error_correction=error_corr)
+    qr.add_data(full_url)
+    qr.best_fit()
+    return qr.version, qr.best_mask_pattern()
+
+
+@cache
+def set_pil_maxblock(size: int) -> None:
+    """
+    Raise Pillow's encoder buffer size to at least ``size`` bytes. Cached, so
+    it only happens once per process, and only for runs that save with
+    Pillow.
+    """
+    from PIL import ImageFile
+
+    ImageFile.MAXBLOCK = max(ImageFile.MAXBLOCK, size)
+
+
+@cache
+def load_label_fonts(scale: int) -> tuple[Any, Any]:
+    """
+    Load the label font and a copy of it at ``scale`` times the size for
+    supersampled rendering.
+    """
+    from PIL import ImageFont
+
+    # Use a much larger font size for better rendering quality (scaled for 2x canvas, increased by 25%)
+    font_size = 100  # Increased by 25% from 80 to 100
+
+    # Try multiple font locations - prefer very smooth, modern fonts
+    font_paths = [
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",  # Clean sans-serif
+        "/usr/share/fonts/liberation/LiberationSans-Regular.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Regular weight is smoother
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "/usr/share/fonts/noto/NotoSans-Regular.ttf",
+        "/usr/share/fonts/truetype/ubuntu/Ubuntu-Regular.ttf",
+        "/usr/share/fonts/truetype/roboto/Roboto-Regular.ttf",
+        "/usr/share/fonts/google-noto/NotoSans-Regular.ttf",
+    ]
+
+    for font_path in font_paths:
+        try:
+            font = ImageFont.truetype(font_path, font_size)
+        except OSError:
+            continue
+        if scale == 1:
+            return font, font
+        return font, ImageFont.truetype(font_path, font_size * scale)
 
-    print(f"\nSuccessfully generated {count} QR codes in '{output_dir}/'")
+    print("WARNING: Could not load TrueType font. Using default font.")
+    print("Install fonts with: sudo pacman -S ttf-dejavu")
+    # The bitmap default font can't be scaled, so render it at its own size
+    font = ImageFont.load_default()
+    return font, font
 
 
 def main(args=None):
@@ -292,6 +526,11 @@ def main(args=None):
         help="Output directory for QR codes when using --csv. Defaults to 'qr_codes'.",
         default="qr_codes",
     )
+    parser.add_option(
+        "--output-zip",
+        help="Store the QR codes generated with --csv in this zip archive "
+        "instead of writing them to --output-dir.",
+    )
     parser.add_option(
         "--column",
         help="Column index to read from (0-based). Defaults to 0.",
@@ -310,6 +549,12 @@ def main(args=None):
         "Defaults to Google Apps Script URL.",
         default="https://script.google.com/macros/s/AKfycbxeY8GP1xl9xF_Fn7rdGeah90fFa07hauK30GvXfdtoUO4gHE9mPdIn25XaFRADWpUhoA/exec",
     )
+    parser.add_option(
+        "--workers",
+        type=int,
+        help="Number of processes (or threads) used to render QR codes when using --csv. "
+        "Defaults to the number of CPUs.",
+    )
     parser.add_option(
         "--qr-size",
         type=int,
@@ -330,6 +575,8 @@ def main(args=None):
             base_url=opts.base_url,
             skip_header=opts.skip_header,
             qr_size=opts.qr_size,
+            workers=opts.workers,
+            output_zip=opts.output_zip,
         )
         return
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING, Any
+from functools import cache
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from qrcode.image.styles.moduledrawers.base import QRModuleDrawer
 
@@ -12,6 +13,92 @@ if TYPE_CHECKING:
 DrawerAliases = dict[str, tuple[type[QRModuleDrawer], dict[str, Any]]]
 
 
+class Layout(NamedTuple):
+    pixel_width: int
+    pixel_height: int
+    text_area_height: int
+    text_gap: int
+    box_size: int
+    pixel_size: int
+    qr_offset_x: int
+    qr_offset_y: int
+    text_offset_y: int
+
+
+@cache
+def compute_layout(width, border, qr_size=None) -> Layout:
+    """
+    Work out where the QR code and its text area go on the fixed canvas.
+
+    The layout only depends on the arguments, so it is cached and shared by
+    every image of the same size.
+    """
+    # Fixed canvas dimensions at 2x resolution for smoother output
+    pixel_width = 288 * 2  # 576px
+    pixel_height = 432 * 2  # 864px
+    # Reserve space for ID text directly below QR code (scaled 2x)
+    text_area_height = 120 * 2  # Larger area for bigger, smoother font
+    text_gap = 42  # Gap reduced by 35% (from 64 to 42 pixels)
+
+    qr_modules = width + border * 2
+
+    if qr_size is not None:
+        # User-specified QR code size - calculate box_size to fit exactly
+        pixel_size = int(qr_size)
+        box_size = max(1, pixel_size // qr_modules)
+        # Recalculate actual pixel_size based on box_size (may be slightly smaller due to rounding)
+        pixel_size = qr_modules * box_size
+    else:
+        # Original auto-sizing logic for backward compatibility
+        # Calculate box_size to fit QR code + text area (72% of canvas width max, reduced by 10%)
+        max_qr_width = int(pixel_width * 0.72)  # Reduced by 10% from 0.8 to 0.72
+        # Leave room for text area when calculating max height
+        available_height = pixel_height - text_area_height - text_gap
+        max_qr_height = int(available_height * 0.81)  # Reduced by 10% from 0.9 to 0.81
+        max_qr_size = min(max_qr_width, max_qr_height)
+        # Calculate appropriate box_size to fit the QR code
+        box_size = max(1, max_qr_size // qr_modules)
+        # Calculate actual QR code dimensions
+        pixel_size = qr_modules * box_size
+
+    # Calculate total content height (QR + gap + text area)
+    total_content_height = pixel_size + text_gap + text_area_height
+    # Center the entire content block (QR + text) vertically
+    top_margin = (pixel_height - total_content_height) // 2
+    # Calculate offsets
+    qr_offset_x = (pixel_width - pixel_size) // 2  # Center horizontally
+    qr_offset_y = top_margin  # QR code at top of content block
+    text_offset_y = qr_offset_y + pixel_size + text_gap  # Text directly below QR
+    return Layout(
+        pixel_width,
+        pixel_height,
+        text_area_height,
+        text_gap,
+        box_size,
+        pixel_size,
+        qr_offset_x,
+        qr_offset_y,
+        text_offset_y,
+    )
+
+
+@cache
+def eye_mask(width) -> tuple[tuple[bool, ...], ...]:
+    """
+    Table of which modules of a ``width`` sized QR code are in an eye, indexed
+    as ``eye_mask(width)[row][col]``.
+    """
+    return tuple(
+        tuple(
+            (row < 7 and col < 7)
+            or (row < 7 and width - col < 8)
+            or (width - row < 8 and col < 7)
+            for col in range(width)
+        )
+        for row in range(width)
+    )
+
+
 class BaseImage(abc.ABC):
     """
     Base QRCode image output class.
@@ -26,44 +113,29 @@ class BaseImage(abc.ABC):
     def __init__(self, border, width, box_size, *args, **kwargs):
         self.border = border
         self.width = width
-        # Fixed canvas dimensions at 2x resolution for smoother output
-        self.pixel_width = 288 * 2  # 576px
-        self.pixel_height = 432 * 2  # 864px
-        # Reserve space for ID text directly below QR code (scaled 2x)
-        self.text_area_height = 120 * 2  # Larger area for bigger, smoother font
-        self.text_gap = 42  # Gap reduced by 35% (from 64 to 42 pixels)
-
         # Get qr_size parameter if provided
         qr_size = kwargs.pop("qr_size", None)
-        qr_modules = width + border * 2
-
-        if qr_size is not None:
-            # User-specified QR code size - calculate box_size to fit exactly
-            self.pixel_size = int(qr_size)
-            self.box_size = max(1, self.pixel_size // qr_modules)
-            # Recalculate actual pixel_size based on box_size (may be slightly smaller due to rounding)
-            self.pixel_size = qr_modules * self.box_size
-        else:
-            # Original auto-sizing logic for backward compatibility
-            # Calculate box_size to fit QR code + text area (72% of canvas width max, reduced by 10%)
-            max_qr_width = int(self.pixel_width * 0.72)  # Reduced by 10% from 0.8 to 0.72
-            # Leave room for text area when calculating max height
-            available_height = self.pixel_height - self.text_area_height - self.text_gap
-            max_qr_height = int(available_height * 0.81)  # Reduced by 10% from 0.9 to 0.81
-            max_qr_size = min(max_qr_width, max_qr_height)
-            # Calculate appropriate box_size to fit the QR code
-            self.box_size = max(1, max_qr_size // qr_modules)
-            # Calculate actual QR code dimensions
-            self.pixel_size = qr_modules * self.box_size
-
-        # Calculate total content height (QR + gap + text area)
-        total_content_height = self.pixel_size + self.text_gap + self.text_area_height
-        # Center the entire content block (QR + text) vertically
-        top_margin = (self.pixel_height - total_content_height) // 2
-        # Calculate offsets
-        self.qr_offset_x = (self.pixel_width - self.pixel_size) // 2  # Center horizontally
-        self.qr_offset_y = top_margin  # QR code at top of content block
-        self.text_offset_y = self.qr_offset_y + self.pixel_size + self.text_gap  # Text directly below QR
+        (
+            self.pixel_width,
+            self.pixel_height,
+            self.text_area_height,
+            self.text_gap,
+            self.box_size,
+            self.pixel_size,
+            self.qr_offset_x,
+            self.qr_offset_y,
+            self.text_offset_y,
+        ) = compute_layout(width, border, qr_size)
+        # Pixel position of module (0, 0), so pixel_box (called once per
+        # module) only has to scale and add
+        self._pixel_x = self.border * self.box_size + self.qr_offset_x
+        self._pixel_y = self.border * self.box_size + self.qr_offset_y
+        self._eye_mask = eye_mask(width)
+        # zlib compression level for encoders that support it (None leaves
+        # the choice to the image factory)
+        self.compress_level = kwargs.pop("compress_level", None)
+        # Draw the QR code a quarter turn clockwise
+        self.rotate_quadrant = kwargs.pop("rotate_quadrant", False)
         self.modules = kwargs.pop("qrcode_modules")
         self._img = self.new_image(**kwargs)
         self.init_new_image()
@@ -97,11 +169,14 @@ class BaseImage(abc.ABC):
         A helper method for pixel-based image generators that specifies the
         four pixel coordinates for a single rect.
         """
-        x = (col + self.border) * self.box_size + self.qr_offset_x
-        y = (row + self.border) * self.box_size + self.qr_offset_y
+        if self.rotate_quadrant:
+            row, col = col, self.width - 1 - row
+        box_size = self.box_size
+        x = col * box_size + self._pixel_x
+        y = row * box_size + self._pixel_y
         return (
             (x, y),
-            (x + self.box_size - 1, y + self.box_size - 1),
+            (x + box_size - 1, y + box_size - 1),
         )
 
     @abc.abstractmethod
@@ -138,11 +213,7 @@ class BaseImage(abc.ABC):
         """
         Find whether the referenced module is in an eye.
         """
-        return (
-            (row < 7 and col < 7)
-            or (row < 7 and self.width - col < 8)
-            or (self.width - row < 8 and col < 7)
-        )
+        return self._eye_mask[row][col]
 
 
 class BaseImageWithDrawer(BaseImage):
@@ -191,10 +262,13 @@ class BaseImageWithDrawer(BaseImage):
     def drawrect_context(self, row: int, col: int, qr: QRCode):
         box = self.pixel_box(row, col)
         drawer = self.eye_drawer if self.is_eye(row, col) else self.module_drawer
-        is_active: bool | ActiveWithNeighbors = (
-            qr.active_with_neighbors(row, col)
-            if drawer.needs_neighbors
-            else bool(qr.modules[row][col])
-        )
+        is_active: bool | ActiveWithNeighbors
+        if drawer.needs_neighbors:
+            is_active = qr.active_with_neighbors(row, col)
+            if self.rotate_quadrant:
+                # Neighbors have to turn with the module
+                is_active = is_active.rotated()
+        else:
+            is_active = bool(qr.modules[row][col])
 
         drawer.drawrect(box, is_active)
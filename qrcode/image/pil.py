@@ -48,6 +48,8 @@ class PilImage(qrcode.image.base.BaseImage):
         kind = kwargs.pop("kind", self.kind)
         if format is None:
             format = kind
+        if self.compress_level is not None:
+            kwargs.setdefault("compress_level", self.compress_level)
         self._img.save(stream, format=format, **kwargs)
 
     def __getattr__(self, name):
@@ -1,9 +1,24 @@
-from itertools import chain
+import io
 from pathlib import Path
 
-from qrcode.compat.png import PngWriter
+from qrcode.compat.numpy import np
+from qrcode.compat.pil import Image
+from qrcode.compat.png import PngProtocolError, PngWriter
 from qrcode.image.base import BaseImage
 
+# Turns a row of 0/1 pixel bytes into ASCII binary digits for int(..., 2)
+_BINARY_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _pack_row(row: bytes) -> bytes:
+    """
+    Pack a row of 0/1 pixel bytes eight to a byte, most significant bit
+    first and zero padded, like np.packbits does.
+    """
+    size = (len(row) + 7) // 8
+    digits = row.translate(_BINARY_DIGITS).ljust(size * 8, b"0")
+    return int(digits, 2).to_bytes(size, "big")
+
 
 class PyPNGImage(BaseImage):
     """
@@ -13,12 +28,30 @@ class PyPNGImage(BaseImage):
     kind = "PNG"
     allowed_kinds = ("PNG",)
     needs_drawrect = False
+    # The canvas is mostly flat white, so the fastest zlib level costs very
+    # little in file size compared to the default of 6.
+    default_compress_level = 1
 
     def new_image(self, **kwargs):
         if not PngWriter:
             raise ImportError("PyPNG library not installed.")
 
-        return PngWriter(self.pixel_width, self.pixel_height, greyscale=True, bitdepth=1)
+        if self.compress_level is None:
+            self.compress_level = self.default_compress_level
+        return PngWriter(
+            self.pixel_width,
+            self.pixel_height,
+            greyscale=True,
+            bitdepth=1,
+            compression=self.compress_level,
+        )
+
+    def init_new_image(self):
+        if self.rotate_quadrant:
+            # pixel_box isn't used here, so turn the matrix itself
+            self.modules = [list(row) for row in zip(*reversed(self.modules))]
+        # pypng only reads the rows, so every white row can share one object
+        self._canvas_row = b"\x01" * self.pixel_width
 
     def drawrect(self, row, col):
         """
@@ -28,29 +61,87 @@ class PyPNGImage(BaseImage):
     def save(self, stream, kind=None):
         if isinstance(stream, str):
             stream = Path(stream).open("wb")  # noqa: SIM115
-        self._img.write(stream, self.rows_iter())
+        # Encode into memory and hand the finished PNG over in one write,
+        # rather than many small writes interleaved with building rows
+        buffer = io.BytesIO()
+        if Image is not None and np is not None:
+            # Pillow's C encoder is much faster than pypng for the same
+            # 1-bit greyscale output.
+            self.pil_image().save(
+                buffer,
+                format="PNG",
+                compress_level=self.compress_level,
+                optimize=False,
+            )
+        elif np is not None:
+            self._img.write_packed(buffer, self.packed_array())
+        else:
+            self._img.write_packed(buffer, self._pure_packed_rows_iter())
+        stream.write(buffer.getvalue())
+
+    def pil_image(self):
+        """
+        Convert the canvas to a 1-bit PIL image.
+        """
+        return Image.frombytes(
+            "1", (self.pixel_width, self.pixel_height), self.packed_array().tobytes()
+        )
+
+    def packed_array(self):
+        """
+        Pack the canvas eight pixels to a byte, most significant bit first.
+
+        This is the row layout of both a bit depth 1 PNG and a PIL mode "1"
+        image. Each row is zero padded to a whole byte, so the canvas width
+        doesn't have to be a multiple of 8.
+        """
+        box_size = self.box_size
+        if self.pixel_size > self.pixel_width:
+            # Fail like pypng does for the overlong rows of rows_iter,
+            # rather than slicing a clipped QR code into the canvas
+            raise PngProtocolError(
+                f"Expected {self.pixel_width} values but got {self.pixel_size} "
+                f"values, in row {max(0, self.qr_offset_y) + self.border * box_size}"
+            )
+        modules = np.asarray(self.modules, dtype=np.uint8)
+        x = self.qr_offset_x + self.border * box_size
+        y = self.qr_offset_y + self.border * box_size
+        # Pack one scanline per module row and only then repeat the packed
+        # lines vertically, so the unpacked buffer is box_size times
+        # smaller than the QR code itself
+        lines = np.ones((len(modules), self.pixel_width), dtype=np.uint8)
+        lines[:, x : x + len(modules) * box_size] = np.repeat(
+            1 - modules, box_size, axis=1
+        )
+        lines = np.packbits(lines, axis=1)
+        white = np.packbits(np.ones(self.pixel_width, dtype=np.uint8))
+        packed = np.tile(white, (self.pixel_height, 1))
+        packed[y : y + len(lines) * box_size] = np.repeat(lines, box_size, axis=0)
+        return packed
 
     def rows_iter(self):
+        """
+        Generate the canvas rows as bytes with one byte per pixel (0 is black,
+        1 is white), whatever optional libraries are installed. Repeated rows
+        are the same object.
+        """
+        canvas_row = self.canvas_row()
         # Top padding to offset QR code
         for _ in range(self.qr_offset_y):
-            yield self.canvas_row()
+            yield canvas_row
         # Border rows at top
         yield from self.border_rows_iter()
-        # QR code data rows
-        border_col = [1] * (self.box_size * self.border)
-        left_padding = [1] * self.qr_offset_x
-        right_padding = [1] * (self.pixel_width - self.qr_offset_x - self.pixel_size)
+        # QR code data rows, built with bytes repetition (one byte per pixel)
+        black = b"\x00" * self.box_size
+        white = b"\x01" * self.box_size
+        border_col = white * self.border
+        left_padding = b"\x01" * self.qr_offset_x
+        right_padding = b"\x01" * (
+            self.pixel_width - self.qr_offset_x - self.pixel_size
+        )
         for module_row in self.modules:
-            qr_row = (
-                border_col
-                + list(
-                    chain.from_iterable(
-                        ([not point] * self.box_size) for point in module_row
-                    )
-                )
-                + border_col
-            )
-            full_row = left_padding + qr_row + right_padding
+            qr_row = b"".join(black if point else white for point in module_row)
+            full_row = left_padding + border_col + qr_row + border_col + right_padding
             for _ in range(self.box_size):
                 yield full_row
         # Border rows at bottom
@@ -58,20 +149,33 @@ class PyPNGImage(BaseImage):
         # Bottom padding (remaining space including text area)
         remaining_height = self.pixel_height - self.qr_offset_y - self.pixel_size
         for _ in range(remaining_height):
-            yield self.canvas_row()
+            yield canvas_row
+
+    def _pure_packed_rows_iter(self):
+        # Rows repeat as the same object, so only pack when the row changes
+        last_row = packed_row = None
+        for i, row in enumerate(self.rows_iter()):
+            if row is not last_row:
+                # write_packed() doesn't check row lengths like write() does
+                if len(row) != self.pixel_width:
+                    raise PngProtocolError(
+                        f"Expected {self.pixel_width} values but got {len(row)} "
+                        f"values, in row {i}"
+                    )
+                last_row, packed_row = row, _pack_row(row)
+            yield packed_row
 
     def border_rows_iter(self):
         """Generate border rows with proper horizontal padding."""
-        left_padding = [1] * self.qr_offset_x
-        border_section = [1] * (self.box_size * (self.width + self.border * 2))
-        right_padding = [1] * (self.pixel_width - self.qr_offset_x - self.pixel_size)
-        border_row = left_padding + border_section + right_padding
+        # The border and its padding are all white, so a border row is the
+        # same as a canvas row
+        border_row = self.canvas_row()
         for _ in range(self.border * self.box_size):
             yield border_row
 
     def canvas_row(self):
-        """Generate a full-width white canvas row."""
-        return [1] * self.pixel_width
+        """Return the full-width white canvas row (the same object each call)."""
+        return self._canvas_row
 
 
 # Keeping this for backwards compatibility.
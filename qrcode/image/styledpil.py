@@ -148,6 +148,8 @@ class StyledPilImage(qrcode.image.base.BaseImageWithDrawer):
         if format is None:
             format = kwargs.get("kind", self.kind)
         kwargs.pop("kind", None)
+        if self.compress_level is not None:
+            kwargs.setdefault("compress_level", self.compress_level)
         self._img.save(stream, format=format, **kwargs)
 
     def __getattr__(self, name):
@@ -61,6 +61,15 @@ class ActiveWithNeighbors(NamedTuple):
     def __bool__(self) -> bool:
         return self.me
 
+    def rotated(self) -> ActiveWithNeighbors:
+        """
+        The same context turned a quarter turn clockwise, so what was the
+        northern neighbor is now the eastern one.
+        """
+        return ActiveWithNeighbors(
+            self.SW, self.W, self.NW, self.S, self.me, self.N, self.SE, self.E, self.NE
+        )
+
 
 GenericImage = TypeVar("GenericImage", bound=BaseImage)
 GenericImageLocal = TypeVar("GenericImageLocal", bound=BaseImage)
@@ -79,6 +88,7 @@ class QRCode(Generic[GenericImage]):
         image_factory: type[GenericImage] | None = None,
         mask_pattern=None,
         qr_size=None,
+        compress_level=None,
     ):
         _check_box_size(box_size)
         _check_border(border)
@@ -91,6 +101,9 @@ class QRCode(Generic[GenericImage]):
         self.mask_pattern = mask_pattern
         self.image_factory = image_factory
         self.qr_size = qr_size if qr_size is None else int(qr_size)
+        self.compress_level = (
+            compress_level if compress_level is None else int(compress_level)
+        )
         if image_factory is not None:
             assert issubclass(image_factory, BaseImage)
         self.clear()
@@ -375,6 +388,8 @@ class QRCode(Generic[GenericImage]):
         # Add qr_size to kwargs if it was specified
         if self.qr_size is not None:
             kwargs["qr_size"] = self.qr_size
+        if self.compress_level is not None:
+            kwargs.setdefault("compress_level", self.compress_level)
 
         im = image_factory(
             self.border,